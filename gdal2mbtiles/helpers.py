@@ -89,7 +89,8 @@ def image_mbtiles(inputfile, outputfile, metadata,
 
 def image_pyramid(inputfile, outputdir,
                   min_resolution=None, max_resolution=None, fill_borders=None,
-                  colors=None, renderer=None, preprocessor=None):
+                  colors=None, renderer=None, preprocessor=None,
+                  dedup_mode=None):
     """
     Slices a GDAL-readable inputfile into a pyramid of PNG tiles.
 
@@ -99,11 +100,13 @@ def image_pyramid(inputfile, outputdir,
     max_resolution: Maximum resolution to upsample tiles.
     fill_borders: Fill borders of image with empty tiles.
     preprocessor: Function to run on the TmsPyramid before slicing.
+    dedup_mode: 'symlink' or 'hardlink'. Defaults to 'symlink'.
 
     Filenames are in the format ``{tms_z}/{tms_x}/{tms_y}.png``.
 
     If a tile duplicates another tile already known to this process, a symlink
-    may be created instead of rendering the same tile to PNG again.
+    (or hard link) may be created instead of rendering the same tile to PNG
+    again.
 
     If `min_resolution` is None, don't downsample.
     If `max_resolution` is None, don't upsample.
@@ -111,7 +114,8 @@ def image_pyramid(inputfile, outputdir,
     if renderer is None:
         renderer = PngRenderer()
     storage = NestedFileStorage(outputdir=outputdir,
-                                renderer=renderer)
+                                renderer=renderer,
+                                dedup_mode=dedup_mode)
     pyramid = TmsPyramid(inputfile=inputfile,
                          storage=storage,
                          min_resolution=min_resolution,
@@ -123,7 +127,8 @@ def image_pyramid(inputfile, outputdir,
 
 
 def image_slice(inputfile, outputdir, fill_borders=None,
-                colors=None, renderer=None, preprocessor=None):
+                colors=None, renderer=None, preprocessor=None,
+                dedup_mode=None):
     """
     Slices a GDAL-readable inputfile into PNG tiles.
 
@@ -135,16 +140,18 @@ def image_slice(inputfile, outputdir, fill_borders=None,
                                   10: rgba(255, 255, 255, 255)})
             Defaults to no colorization.
     preprocessor: Function to run on the TmsPyramid before slicing.
+    dedup_mode: 'symlink' or 'hardlink'. Defaults to 'symlink'.
 
     Filenames are in the format ``{tms_z}-{tms_x}-{tms_y}-{image_hash}.png``.
 
     If a tile duplicates another tile already known to this process, a symlink
-    is created instead of rendering the same tile to PNG again.
+    (or hard link) is created instead of rendering the same tile to PNG again.
     """
     if renderer is None:
         renderer = PngRenderer()
     storage = SimpleFileStorage(outputdir=outputdir,
-                                renderer=renderer)
+                                renderer=renderer,
+                                dedup_mode=dedup_mode)
     pyramid = TmsPyramid(inputfile=inputfile,
                          storage=storage,
                          min_resolution=None,
@@ -214,7 +221,7 @@ def warp_mbtiles(inputfile, outputfile, metadata, colors=None, band=None,
 def warp_pyramid(inputfile, outputdir, colors=None, band=None,
                  spatial_ref=None, resampling=None,
                  min_resolution=None, max_resolution=None, fill_borders=None,
-                 renderer=None):
+                 renderer=None, dedup_mode=None):
     """
     Warps a GDAL-readable inputfile into a pyramid of PNG tiles.
 
@@ -234,11 +241,13 @@ def warp_pyramid(inputfile, outputdir, colors=None, band=None,
     min_resolution: Minimum resolution to downsample tiles.
     max_resolution: Maximum resolution to upsample tiles.
     fill_borders: Fill borders of image with empty tiles.
+    dedup_mode: 'symlink' or 'hardlink'. Defaults to 'symlink'.
 
     Filenames are in the format ``{tms_z}/{tms_x}/{tms_y}.png``.
 
     If a tile duplicates another tile already known to this process, a symlink
-    may be created instead of rendering the same tile to PNG again.
+    (or hard link) may be created instead of rendering the same tile to PNG
+    again.
 
     If `min_resolution` is None, don't downsample.
     If `max_resolution` is None, don't upsample.
@@ -262,12 +271,13 @@ def warp_pyramid(inputfile, outputdir, colors=None, band=None,
                              max_resolution=max_resolution,
                              colors=colors, renderer=renderer,
                              preprocessor=preprocessor,
-                             fill_borders=fill_borders)
+                             fill_borders=fill_borders,
+                             dedup_mode=dedup_mode)
 
 
 def warp_slice(inputfile, outputdir, fill_borders=None, colors=None, band=None,
                spatial_ref=None, resampling=None,
-               renderer=None):
+               renderer=None, dedup_mode=None):
     """
     Warps a GDAL-readable inputfile into a directory of PNG tiles.
 
@@ -287,11 +297,13 @@ def warp_slice(inputfile, outputdir, fill_borders=None, colors=None, band=None,
 
     min_resolution: Minimum resolution to downsample tiles.
     max_resolution: Maximum resolution to upsample tiles.
+    dedup_mode: 'symlink' or 'hardlink'. Defaults to 'symlink'.
 
     Filenames are in the format ``{tms_z}-{tms_x}-{tms_y}-{image_hash}.png``.
 
     If a tile duplicates another tile already known to this process, a symlink
-    may be created instead of rendering the same tile to PNG again.
+    (or hard link) may be created instead of rendering the same tile to PNG
+    again.
     """
     if colors and band is None:
         band = 1
@@ -306,7 +318,8 @@ def warp_slice(inputfile, outputdir, fill_borders=None, colors=None, band=None,
         return image_slice(inputfile=warped, outputdir=outputdir,
                            colors=colors, renderer=renderer,
                            preprocessor=preprocessor,
-                           fill_borders=fill_borders)
+                           fill_borders=fill_borders,
+                           dedup_mode=dedup_mode)
 
 
 # Preprocessors
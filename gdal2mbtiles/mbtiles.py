@@ -352,6 +352,7 @@ class MBTiles(object):
     def close(self, remove_journal=True):
         """Closes the file."""
         if self._conn is not None:
+            self._conn.commit()
             if remove_journal:
                 self._conn.execute('PRAGMA journal_mode = DELETE')
             self._conn.close()
@@ -501,38 +502,51 @@ class MBTiles(object):
             self._metadata = M(mbtiles=self)
         return self._metadata
 
-    def insert(self, x, y, z, hashed, data=None):
+    def commit(self):
+        """Commits inserts made with commit=False."""
+        if self._conn is not None:
+            self._conn.commit()
+
+    def insert(self, x, y, z, hashed, data=None, commit=True):
         """
         Inserts a tile in the database at coordinates `x`, `y`, `z`.
 
         x, y, z: TMS coordinates for the tile.
         hashed: Integer hash of the raw image data, not compressed or encoded.
         data: Compressed and encoded image buffer.
+        commit: Commit immediately. If False, the insert stays in the open
+                transaction until `commit()` or `close()`.
         """
         # tile_id must be a 64-bit signed integer, but hashing functions
         # produce unsigned integers.
         hashed = unpack(b'q', pack(b'Q', hashed & 0xffffffffffffffff))[0]
-        with self._conn:
-            if data is not None:
-                # Insert tile data into images
-                self._conn.execute(
-                    """
-                    INSERT OR REPLACE INTO images (tile_id, tile_data)
-                    VALUES (:hashed, :data)
-                    """,
-                    {'hashed': hashed, 'data': data}
-                )
+        if commit:
+            with self._conn:
+                self._insert(x=x, y=y, z=z, hashed=hashed, data=data)
+        else:
+            self._insert(x=x, y=y, z=z, hashed=hashed, data=data)
 
-            # Always associate map with image
+    def _insert(self, x, y, z, hashed, data):
+        if data is not None:
+            # Insert tile data into images
             self._conn.execute(
                 """
-                INSERT OR REPLACE
-                INTO map (zoom_level, tile_column, tile_row, tile_id)
-                VALUES (:z, :x, :y, :hashed)
+                INSERT OR REPLACE INTO images (tile_id, tile_data)
+                VALUES (:hashed, :data)
                 """,
-                {'x': x, 'y': y, 'z': z, 'hashed': hashed}
+                {'hashed': hashed, 'data': data}
             )
 
+        # Always associate map with image
+        self._conn.execute(
+            """
+            INSERT OR REPLACE
+            INTO map (zoom_level, tile_column, tile_row, tile_id)
+            VALUES (:z, :x, :y, :hashed)
+            """,
+            {'x': x, 'y': y, 'z': z, 'hashed': hashed}
+        )
+
     def get(self, x, y, z):
         """
         Returns the compressed image data at coordinates `x`, `y`, `z`.
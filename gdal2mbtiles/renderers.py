@@ -89,10 +89,7 @@ class JpegRenderer(Renderer):
         if image.bands > 3:
             # Strip out alpha channel, otherwise transparent pixels turn white.
             image = image.extract_band(0, n=3)
-        with NamedTemporaryFile(suffix=self.suffix,
-                                dir=self.tempdir) as rendered:
-            image.write_to_file(rendered.name, **self._vips_options)
-            return rendered.read()
+        return image.write_to_buffer(self.suffix, **self._vips_options)
 
 
 class PngRenderer(Renderer):
@@ -168,6 +165,10 @@ class PngRenderer(Renderer):
 
     def render(self, image):
         """Returns the rendered VIPS `image`."""
+        if self.png8 is False and self.optimize is False:
+            # Nothing to post-process, so encode straight to memory.
+            return image.write_to_buffer(self.suffix, **self._vips_options)
+
         with NamedTemporaryFile(suffix=self.suffix,
                                 dir=self.tempdir) as rendered:
             image.write_to_file(rendered.name, **self._vips_options)
@@ -43,15 +43,19 @@ except NameError:
 class Storage(object):
     """Base class for storages."""
 
-    def __init__(self, renderer, pool=None):
+    def __init__(self, renderer, pool=None, hasher=None):
         """
         Initialize a storage.
 
         renderer: Used to render images into tiles.
+        hasher: Function returning an integer hash of raw image data.
+                Defaults to intmd5.
         """
         self.renderer = renderer
 
-        self.hasher = intmd5
+        if hasher is None:
+            hasher = intmd5
+        self.hasher = hasher
 
     def __enter__(self):
         return self
@@ -71,8 +75,12 @@ class Storage(object):
         """Runs after `pyramid` has finished importing into this storage."""
         pass
 
-    def save(self, x, y, z, image):
-        """Saves `image` at coordinates `x`, `y`, and `z`."""
+    def save(self, x, y, z, image, hashed=None):
+        """
+        Saves `image` at coordinates `x`, `y`, and `z`.
+
+        hashed: Content hash of `image`, if the caller already has it.
+        """
         raise NotImplementedError()
 
     def save_border(self, x, y, z):
@@ -93,12 +101,17 @@ class SimpleFileStorage(Storage):
     Saves tiles in `outputdir` as 'z-x-y-hash.ext'.
     """
 
-    def __init__(self, renderer, outputdir, seen=None, **kwargs):
+    DEDUP_MODES = ('symlink', 'hardlink')
+
+    def __init__(self, renderer, outputdir, seen=None, dedup_mode=None,
+                 **kwargs):
         """
         Initializes storage.
 
         renderer: Used to render images into tiles.
         outputdir: Output directory for tiles
+        dedup_mode: How duplicate tiles point at the first copy, either
+                    'symlink' or 'hardlink'. Default 'symlink'.
         pool: Process pool to coordinate subprocesses.
         """
         super(SimpleFileStorage, self).__init__(renderer=renderer,
@@ -106,6 +119,16 @@ class SimpleFileStorage(Storage):
         if seen is None:
             seen = {}
         self.seen = seen
+
+        if dedup_mode is None:
+            dedup_mode = 'symlink'
+        if dedup_mode not in self.DEDUP_MODES:
+            raise ValueError(
+                'dedup_mode must be one of {0!r}: {1!r}'.format(
+                    self.DEDUP_MODES, dedup_mode
+                )
+            )
+        self.dedup_mode = dedup_mode
         self._border_hashed = None
 
         self.outputdir = outputdir
@@ -116,12 +139,13 @@ class SimpleFileStorage(Storage):
         return ('{z}-{x}-{y}-{hashed:x}'.format(**locals()) +
                 self.renderer.suffix)
 
-    def save(self, x, y, z, image):
+    def save(self, x, y, z, image, hashed=None):
         """Saves `image` at coordinates `x`, `y`, and `z`."""
-        hashed = self.get_hash(image)
+        if hashed is None:
+            hashed = self.get_hash(image)
         filepath = self.filepath(x=x, y=y, z=z, hashed=hashed)
         if hashed in self.seen:
-            self.symlink(src=self.seen[hashed], dst=filepath)
+            self.link(src=self.seen[hashed], dst=filepath)
         else:
             self.seen[hashed] = filepath
             contents = self.renderer.render(image)
@@ -129,6 +153,18 @@ class SimpleFileStorage(Storage):
             with open(outputfile, 'wb') as output:
                 output.write(contents)
 
+    def link(self, src, dst):
+        """Links dst to src, as set by dedup_mode."""
+        if self.dedup_mode == 'hardlink':
+            self.hardlink(src=src, dst=dst)
+        else:
+            self.symlink(src=src, dst=dst)
+
+    def hardlink(self, src, dst):
+        """Creates a hard link from dst to src."""
+        os.link(os.path.join(self.outputdir, src),
+                os.path.join(self.outputdir, dst))
+
     def symlink(self, src, dst):
         """Creates a relative symlink from dst to src."""
         absdst = os.path.join(self.outputdir, dst)
@@ -142,11 +178,11 @@ class SimpleFileStorage(Storage):
         if self._border_hashed is None or self._border_hashed not in self.seen:
             image = self._border_image()
             self._border_hashed = self.get_hash(image)
-            self.save(x=x, y=y, z=z, image=image)
+            self.save(x=x, y=y, z=z, image=image, hashed=self._border_hashed)
         else:
             # self._border_hashed will already be in self.seen
             filepath = self.filepath(x=x, y=y, z=z, hashed=self._border_hashed)
-            self.symlink(src=self.seen[self._border_hashed], dst=filepath)
+            self.link(src=self.seen[self._border_hashed], dst=filepath)
 
 
 class NestedFileStorage(SimpleFileStorage):
@@ -177,10 +213,11 @@ class NestedFileStorage(SimpleFileStorage):
                      ignore_exists=True)
             self.madedirs[z][x] = True
 
-    def save(self, x, y, z, image):
+    def save(self, x, y, z, image, hashed=None):
         """Saves `image` at coordinates `x`, `y`, and `z`."""
         self.makedirs(x=x, y=y, z=z)
-        return super(NestedFileStorage, self).save(x=x, y=y, z=z, image=image)
+        return super(NestedFileStorage, self).save(x=x, y=y, z=z, image=image,
+                                                   hashed=hashed)
 
     def save_border(self, x, y, z):
         """Saves a border image at coordinates `x`, `y`, and `z`."""
@@ -259,6 +296,10 @@ class MbtilesStorage(Storage):
 
     def post_import(self, pyramid):
         """Insert the dataset extents into the metadata."""
+        # Tiles are inserted without committing, so that a whole pyramid is
+        # written in one transaction.
+        self.mbtiles.commit()
+
         # The MBTiles spec says that the bounds must be in EPSG:4326
         transform = pyramid.dataset.GetCoordinateTransformation(
             dst_ref=SpatialReference.FromEPSG(4326)
@@ -270,13 +311,15 @@ class MbtilesStorage(Storage):
         self.mbtiles.metadata['bounds'] = (lower_left.x, lower_left.y,
                                            upper_right.x, upper_right.y)
 
-    def save(self, x, y, z, image):
+    def save(self, x, y, z, image, hashed=None):
         """Saves `image` at coordinates `x`, `y`, and `z`."""
-        hashed = self.get_hash(image)
+        if hashed is None:
+            hashed = self.get_hash(image)
         if hashed in self.seen:
             self.mbtiles.insert(x=x, y=y,
                                 z=z + self.zoom_offset,
-                                hashed=hashed)
+                                hashed=hashed,
+                                commit=False)
         else:
             self.seen.add(hashed)
             contents = self.renderer.render(image)
@@ -287,16 +330,18 @@ class MbtilesStorage(Storage):
             self.mbtiles.insert(x=x, y=y,
                                 z=z + self.zoom_offset,
                                 hashed=hashed,
-                                data=data)
+                                data=data,
+                                commit=False)
 
     def save_border(self, x, y, z):
         """Saves a border image at coordinates `x`, `y`, and `z`."""
         if self._border_hashed is None:
             image = self._border_image()
-            self.save(x=x, y=y, z=z, image=image)
             self._border_hashed = self.get_hash(image)
+            self.save(x=x, y=y, z=z, image=image, hashed=self._border_hashed)
         else:
             # self._border_hashed will already be inserted
             self.mbtiles.insert(x=x, y=y,
                                 z=z + self.zoom_offset,
-                                hashed=self._border_hashed)
+                                hashed=self._border_hashed,
+                                commit=False)
@@ -68,16 +68,35 @@ def rmfile(path, ignore_missing=False):
 
 def recursive_listdir(directory):
     """Generator of all files in `directory`, recursively."""
-    for root, dirs, files in os.walk(directory):
-        root = os.path.relpath(root, directory)
-        if root == '.':
-            root = ''
-        for d in dirs:
-            yield os.path.join(root, d) + os.path.sep
-        for f in files:
-            yield os.path.join(root, f)
+    # Like os.walk(), but yields paths relative to `directory` directly from
+    # the cached os.DirEntry types, without a relpath() for every directory.
+    # As with os.walk(), directories that cannot be listed are skipped.
+    stack = ['']
+    while stack:
+        root = stack.pop()
+        try:
+            entries = os.scandir(os.path.join(directory, root))
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                path = os.path.join(root, entry.name)
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    yield path
+                    continue
+                yield path + os.path.sep
+                try:
+                    is_symlink = entry.is_symlink()
+                except OSError:
+                    is_symlink = False
+                if not is_symlink:
+                    stack.append(path)
 
 
 def intmd5(x):
     """Returns the MD5 digest of `x` as an integer."""
-    return int(md5(x).hexdigest(), base=16)
+    return int.from_bytes(md5(x).digest(), byteorder='big')
@@ -872,7 +872,7 @@ class TmsTiles(object):
         # Note: You cannot upsample tile-by-tile because it looks ugly at the
         # boundaries.
         assert levels > 0
-        scale = 2 ** levels
+        scale = 1 << levels
         offset = self.offset * scale
         stretched = VImageAdapter(self.image).stretch(xscale=scale, yscale=scale)
         aligned = VImageAdapter(stretched).tms_align(tile_width=self.tile_width,
@@ -44,6 +44,7 @@ setup(
         "tests": [
             "pytest",
             "pytest-pythonpath",
+            "pytest-xdist",
             "distro; platform_system=='Linux'"
         ],
     },
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os
+import tempfile
+
+
+# Keep the tests' scratch files on tmpfs where one is writable, unless the
+# developer chose a TMPDIR. The tests only create temporary files through
+# tempfile, so setting its default directory covers all of them.
+if not os.environ.get('TMPDIR') and os.access('/dev/shm', os.W_OK):
+    tempfile.tempdir = '/dev/shm'
@@ -3,9 +3,9 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+from functools import lru_cache
 from math import log
 import os
-import subprocess
 from tempfile import NamedTemporaryFile
 import unittest
 
@@ -16,7 +16,7 @@ from osgeo.gdalconst import GRA_Cubic
 
 import pytest
 
-from gdal2mbtiles.constants import EPSG_WEB_MERCATOR, GDALINFO, TILE_SIDE
+from gdal2mbtiles.constants import EPSG_WEB_MERCATOR, TILE_SIDE
 from gdal2mbtiles.exceptions import (GdalError, CalledGdalError,
                                      UnalignedInputError,
                                      UnknownResamplingMethodError)
@@ -27,6 +27,15 @@ from gdal2mbtiles.gd_types import Extents, XY
 
 TEST_ASSET_DIR = os.path.dirname(__file__)
 
+# Whole world: (180°W, 85°S), (180°E, 85°N)
+BLUEMARBLE = os.path.join(TEST_ASSET_DIR, 'bluemarble.tif')
+
+
+@lru_cache(maxsize=None)
+def warp_bluemarble():
+    """Returns warp(BLUEMARBLE), running gdalwarp only once per session."""
+    return warp(BLUEMARBLE)
+
 
 class TestCase(unittest.TestCase):
     def assertExtentsEqual(self, first, second, places=2):
@@ -69,18 +78,16 @@ class TestExtractColorBand(unittest.TestCase):
 
 class TestWarp(unittest.TestCase):
     def setUp(self):
-        # Whole world: (180°W, 85°S), (180°E, 85°N)
-        self.inputfile = os.path.join(TEST_ASSET_DIR,
-                                      'bluemarble.tif')
+        self.inputfile = BLUEMARBLE
 
         # Aligned partial: (90°W, 42.5°S), (0°E, 0°N)
         self.alignedfile = os.path.join(TEST_ASSET_DIR,
                                         'bluemarble-aligned-ll.tif')
 
     def test_simple(self):
-        root = warp(self.inputfile).get_root()
+        root = warp_bluemarble().get_root()
         self.assertEqual(root.tag, 'VRTDataset')
-        self.assertTrue(all(t.text == self.inputfile
+        self.assertTrue(all(t.text == BLUEMARBLE
                             for t in root.findall('.//SourceDataset')))
 
     def test_resampling(self):
@@ -103,7 +110,7 @@ class TestWarp(unittest.TestCase):
                           warp, self.inputfile, resampling='montecarlo')
 
     def test_spatial_ref(self):
-        root = warp(self.inputfile).get_root()
+        root = warp_bluemarble().get_root()
         # self.assertTrue('"EPSG","3857"' in root.find('.//TargetSRS').text)
         # Already in EPSG 3857 so no TargetSRS or SourceSRS in output (GDAL 2?)
         self.assertIsNone(root.find('.//TargetSRS'))
@@ -113,12 +120,13 @@ class TestWarp(unittest.TestCase):
                     spatial_ref=SpatialReference.FromEPSG(4326)).get_root()
         self.assertTrue('WGS 84' in root.find('.//TargetSRS').text)
 
-    def test_invalid(self):
-        self.assertRaises(GdalError, warp, '/dev/null')
-
-    def test_missing(self):
-        self.assertRaises(IOError,
-                          warp, os.path.join(TEST_ASSET_DIR, 'missing.tif'))
+    def test_error_paths(self):
+        for inputfile, exception in [
+            ('/dev/null', GdalError),
+            (os.path.join(TEST_ASSET_DIR, 'missing.tif'), IOError),
+        ]:
+            with self.subTest(inputfile=inputfile):
+                self.assertRaises(exception, warp, inputfile)
 
     def test_nodata(self):
         inputfile = os.path.join(TEST_ASSET_DIR, 'srtm.nodata.tif')
@@ -172,8 +180,7 @@ class TestPreprocess(unittest.TestCase):
 
 class TestVrt(TestCase):
     def setUp(self):
-        self.inputfile = os.path.join(TEST_ASSET_DIR,
-                                      'bluemarble.tif')
+        self.inputfile = BLUEMARBLE
         self.empty = b'<VRTDataset> </VRTDataset>'
 
     def test_str(self):
@@ -192,19 +199,14 @@ class TestVrt(TestCase):
             self.assertEqual(tempfile.read(), self.empty)
 
     def test_world(self):
-        vrt = warp(self.inputfile)
         with NamedTemporaryFile(suffix='.tif') as tmpfile:
             outputfile = tmpfile.name
-            vrt.render(outputfile=outputfile, compress='LZW')
-            self.assertEqual(
-                subprocess.call([GDALINFO, outputfile],
-                                stdout=open('/dev/null', 'w+')),
-                0
-            )
+            warp_bluemarble().render(outputfile=outputfile, compress='LZW')
+            # Dataset() raises GdalError if GDAL cannot open the output.
+            out_data = Dataset(outputfile)
 
             # Test that the metadata hasn't been munged by warp()
             in_data = Dataset(self.inputfile)
-            out_data = Dataset(outputfile)
             self.assertExtentsEqual(in_data.GetExtents(),
                                     out_data.GetExtents())
             self.assertEqual(in_data.RasterXSize, out_data.RasterXSize)
@@ -216,15 +218,11 @@ class TestVrt(TestCase):
         with NamedTemporaryFile(suffix='.tif') as tmpfile:
             outputfile = tmpfile.name
             vrt.render(outputfile=outputfile, compress='LZW')
-            self.assertEqual(
-                subprocess.call([GDALINFO, outputfile],
-                                stdout=open('/dev/null', 'w+')),
-                0
-            )
+            # Dataset() raises GdalError if GDAL cannot open the output.
+            out_data = Dataset(outputfile)
 
             # Test that the metadata hasn't been munged by warp()
             in_data = Dataset(inputfile)
-            out_data = Dataset(outputfile)
             self.assertExtentsEqual(in_data.GetExtents(),
                                     out_data.GetExtents())
             self.assertEqual(in_data.RasterXSize, out_data.RasterXSize)
@@ -236,14 +234,10 @@ class TestVrt(TestCase):
         with NamedTemporaryFile(suffix='.tif') as tmpfile:
             outputfile = tmpfile.name
             vrt.render(outputfile=outputfile, compress='LZW')
-            self.assertEqual(
-                subprocess.call([GDALINFO, outputfile],
-                                stdout=open('/dev/null', 'w+')),
-                0
-            )
+            # Dataset() raises GdalError if GDAL cannot open the output.
+            out_data = Dataset(outputfile)
 
             # Should be a 412×412 image
-            out_data = Dataset(outputfile)
             self.assertEqual(out_data.RasterXSize, 412)
             self.assertEqual(out_data.RasterYSize, 412)
 
@@ -257,9 +251,8 @@ class TestVrt(TestCase):
     @pytest.mark.skip_on_ci
     def test_invalid_output(self):
         # this will fail if tests are run as root
-        vrt = warp(self.inputfile)
         self.assertRaises(OSError,
-                          vrt.render,
+                          warp_bluemarble().render,
                           outputfile='/dev/invalid')
 
 
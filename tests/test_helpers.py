@@ -18,6 +18,22 @@ from gdal2mbtiles.utils import intmd5, NamedTemporaryDir, recursive_listdir
 TEST_ASSET_DIR = os.path.dirname(__file__)
 
 
+def pyramid_listing(resolutions, suffix='.png'):
+    """
+    Returns the recursive_listdir() of a whole-world NestedFileStorage
+    pyramid, for every resolution in `resolutions`.
+    """
+    listing = set()
+    for z in resolutions:
+        listing.add('{z}/'.format(z=z))
+        for x in range(0, 2 ** z):
+            listing.add('{z}/{x}/'.format(z=z, x=x))
+            listing.update('{z}/{x}/{y}{suffix}'.format(z=z, x=x, y=y,
+                                                        suffix=suffix)
+                           for y in range(0, 2 ** z))
+    return listing
+
+
 class TestImageMbtiles(unittest.TestCase):
     def setUp(self):
         self.inputfile = os.path.join(TEST_ASSET_DIR, 'bluemarble-aligned-ll.tif')
@@ -67,29 +83,7 @@ class TestImagePyramid(unittest.TestCase):
 
             self.assertEqual(
                 set(recursive_listdir(outputdir)),
-                set((
-                    '2/',
-                    '2/0/',
-                    '2/0/0.png',
-                    '2/0/1.png',
-                    '2/0/2.png',
-                    '2/0/3.png',
-                    '2/1/',
-                    '2/1/0.png',
-                    '2/1/1.png',
-                    '2/1/2.png',
-                    '2/1/3.png',
-                    '2/2/',
-                    '2/2/0.png',
-                    '2/2/1.png',
-                    '2/2/2.png',
-                    '2/2/3.png',
-                    '2/3/',
-                    '2/3/0.png',
-                    '2/3/1.png',
-                    '2/3/2.png',
-                    '2/3/3.png',
-                ))
+                pyramid_listing(resolutions=range(2, 3))
             )
 
     def test_downsample(self):
@@ -101,39 +95,7 @@ class TestImagePyramid(unittest.TestCase):
             files = set(recursive_listdir(outputdir))
             self.assertEqual(
                 files,
-                set((
-                    '0/',
-                    '0/0/',
-                    '0/0/0.png',
-                    '1/',
-                    '1/0/',
-                    '1/0/0.png',
-                    '1/0/1.png',
-                    '1/1/',
-                    '1/1/0.png',
-                    '1/1/1.png',
-                    '2/',
-                    '2/0/',
-                    '2/0/0.png',
-                    '2/0/1.png',
-                    '2/0/2.png',
-                    '2/0/3.png',
-                    '2/1/',
-                    '2/1/0.png',
-                    '2/1/1.png',
-                    '2/1/2.png',
-                    '2/1/3.png',
-                    '2/2/',
-                    '2/2/0.png',
-                    '2/2/1.png',
-                    '2/2/2.png',
-                    '2/2/3.png',
-                    '2/3/',
-                    '2/3/0.png',
-                    '2/3/1.png',
-                    '2/3/2.png',
-                    '2/3/3.png',
-                ))
+                pyramid_listing(resolutions=range(0, 3))
             )
 
     def test_downsample_aligned(self):
@@ -145,40 +107,7 @@ class TestImagePyramid(unittest.TestCase):
             files = set(recursive_listdir(outputdir))
             self.assertEqual(
                 files,
-                set((
-                    '0/',
-                    '0/0/',
-                    '0/0/0.png',
-                    '1/',
-                    '1/0/',
-                    '1/1/',
-                    '1/0/0.png',
-                    '2/',
-                    '2/0/',
-                    '2/1/',
-                    '2/2/',
-                    '2/3/',
-                    '2/1/1.png',
-                    # The following are the borders
-                    '1/0/1.png',
-                    '1/1/0.png',
-                    '1/1/1.png',
-                    '2/0/0.png',
-                    '2/0/1.png',
-                    '2/0/2.png',
-                    '2/0/3.png',
-                    '2/1/0.png',
-                    '2/1/2.png',
-                    '2/1/3.png',
-                    '2/2/0.png',
-                    '2/2/1.png',
-                    '2/2/2.png',
-                    '2/2/3.png',
-                    '2/3/0.png',
-                    '2/3/1.png',
-                    '2/3/2.png',
-                    '2/3/3.png',
-                ))
+                pyramid_listing(resolutions=range(0, 3))
             )
 
     def test_downsample_spanning(self):
@@ -199,102 +128,7 @@ class TestImagePyramid(unittest.TestCase):
             files = set(recursive_listdir(outputdir))
             self.assertEqual(
                 files,
-                set((
-                    '2/',
-                    '2/0/',
-                    '2/0/0.png',
-                    '2/0/1.png',
-                    '2/0/2.png',
-                    '2/0/3.png',
-                    '2/1/',
-                    '2/1/0.png',
-                    '2/1/1.png',
-                    '2/1/2.png',
-                    '2/1/3.png',
-                    '2/2/',
-                    '2/2/0.png',
-                    '2/2/1.png',
-                    '2/2/2.png',
-                    '2/2/3.png',
-                    '2/3/',
-                    '2/3/0.png',
-                    '2/3/1.png',
-                    '2/3/2.png',
-                    '2/3/3.png',
-                    '3/',
-                    '3/0/',
-                    '3/0/0.png',
-                    '3/0/1.png',
-                    '3/0/2.png',
-                    '3/0/3.png',
-                    '3/0/4.png',
-                    '3/0/5.png',
-                    '3/0/6.png',
-                    '3/0/7.png',
-                    '3/1/',
-                    '3/1/0.png',
-                    '3/1/1.png',
-                    '3/1/2.png',
-                    '3/1/3.png',
-                    '3/1/4.png',
-                    '3/1/5.png',
-                    '3/1/6.png',
-                    '3/1/7.png',
-                    '3/2/',
-                    '3/2/0.png',
-                    '3/2/1.png',
-                    '3/2/2.png',
-                    '3/2/3.png',
-                    '3/2/4.png',
-                    '3/2/5.png',
-                    '3/2/6.png',
-                    '3/2/7.png',
-                    '3/3/',
-                    '3/3/0.png',
-                    '3/3/1.png',
-                    '3/3/2.png',
-                    '3/3/3.png',
-                    '3/3/4.png',
-                    '3/3/5.png',
-                    '3/3/6.png',
-                    '3/3/7.png',
-                    '3/4/',
-                    '3/4/0.png',
-                    '3/4/1.png',
-                    '3/4/2.png',
-                    '3/4/3.png',
-                    '3/4/4.png',
-                    '3/4/5.png',
-                    '3/4/6.png',
-                    '3/4/7.png',
-                    '3/5/',
-                    '3/5/0.png',
-                    '3/5/1.png',
-                    '3/5/2.png',
-                    '3/5/3.png',
-                    '3/5/4.png',
-                    '3/5/5.png',
-                    '3/5/6.png',
-                    '3/5/7.png',
-                    '3/6/',
-                    '3/6/0.png',
-                    '3/6/1.png',
-                    '3/6/2.png',
-                    '3/6/3.png',
-                    '3/6/4.png',
-                    '3/6/5.png',
-                    '3/6/6.png',
-                    '3/6/7.png',
-                    '3/7/',
-                    '3/7/0.png',
-                    '3/7/1.png',
-                    '3/7/2.png',
-                    '3/7/3.png',
-                    '3/7/4.png',
-                    '3/7/5.png',
-                    '3/7/6.png',
-                    '3/7/7.png',
-                ))
+                pyramid_listing(resolutions=range(2, 4))
             )
 
     def test_upsample_symlink(self):
@@ -309,114 +143,33 @@ class TestImagePyramid(unittest.TestCase):
             files = set(recursive_listdir(outputdir))
             self.assertEqual(
                 files,
-                set([
-                    '0/',
-                    '0/0/',
-                    '0/0/0.png',
-                    '1/',
-                    '1/0/',
-                    '1/0/0.png',
-                    '1/0/1.png',
-                    '1/1/',
-                    '1/1/0.png',
-                    '1/1/1.png',
-                    '2/',
-                    '2/0/',
-                    '2/0/0.png',
-                    '2/0/1.png',
-                    '2/0/2.png',
-                    '2/0/3.png',
-                    '2/1/',
-                    '2/1/0.png',
-                    '2/1/1.png',
-                    '2/1/2.png',
-                    '2/1/3.png',
-                    '2/2/',
-                    '2/2/0.png',
-                    '2/2/1.png',
-                    '2/2/2.png',
-                    '2/2/3.png',
-                    '2/3/',
-                    '2/3/0.png',
-                    '2/3/1.png',
-                    '2/3/2.png',
-                    '2/3/3.png',
-                    '3/',
-                    '3/0/',
-                    '3/0/0.png',
-                    '3/0/1.png',
-                    '3/0/2.png',
-                    '3/0/3.png',
-                    '3/0/4.png',
-                    '3/0/5.png',
-                    '3/0/6.png',
-                    '3/0/7.png',
-                    '3/1/',
-                    '3/1/0.png',
-                    '3/1/1.png',
-                    '3/1/2.png',
-                    '3/1/3.png',
-                    '3/1/4.png',
-                    '3/1/5.png',
-                    '3/1/6.png',
-                    '3/1/7.png',
-                    '3/2/',
-                    '3/2/0.png',
-                    '3/2/1.png',
-                    '3/2/2.png',
-                    '3/2/3.png',
-                    '3/2/4.png',
-                    '3/2/5.png',
-                    '3/2/6.png',
-                    '3/2/7.png',
-                    '3/3/',
-                    '3/3/0.png',
-                    '3/3/1.png',
-                    '3/3/2.png',
-                    '3/3/3.png',
-                    '3/3/4.png',
-                    '3/3/5.png',
-                    '3/3/6.png',
-                    '3/3/7.png',
-                    '3/4/',
-                    '3/4/0.png',
-                    '3/4/1.png',
-                    '3/4/2.png',
-                    '3/4/3.png',
-                    '3/4/4.png',
-                    '3/4/5.png',
-                    '3/4/6.png',
-                    '3/4/7.png',
-                    '3/5/',
-                    '3/5/0.png',
-                    '3/5/1.png',
-                    '3/5/2.png',
-                    '3/5/3.png',
-                    '3/5/4.png',
-                    '3/5/5.png',
-                    '3/5/6.png',
-                    '3/5/7.png',
-                    '3/6/',
-                    '3/6/0.png',
-                    '3/6/1.png',
-                    '3/6/2.png',
-                    '3/6/3.png',
-                    '3/6/4.png',
-                    '3/6/5.png',
-                    '3/6/6.png',
-                    '3/6/7.png',
-                    '3/7/',
-                    '3/7/0.png',
-                    '3/7/1.png',
-                    '3/7/2.png',
-                    '3/7/3.png',
-                    '3/7/4.png',
-                    '3/7/5.png',
-                    '3/7/6.png',
-                    '3/7/7.png',
-                ])
+                pyramid_listing(resolutions=range(0, 4))
+            )
+
+    def test_upsample_hardlink(self):
+        with NamedTemporaryDir() as outputdir:
+            zoom = 3
+
+            dataset = Dataset(self.upsamplingfile)
+            image_pyramid(inputfile=self.upsamplingfile, outputdir=outputdir,
+                          max_resolution=dataset.GetNativeResolution() + zoom,
+                          renderer=TouchRenderer(suffix='.png'),
+                          dedup_mode='hardlink')
+
+            files = set(recursive_listdir(outputdir))
+            self.assertEqual(
+                files,
+                pyramid_listing(resolutions=range(0, 4))
             )
 
+            tiles = [os.path.join(outputdir, f) for f in files
+                     if f.endswith('.png')]
+            self.assertFalse([t for t in tiles if os.path.islink(t)])
+
+            # Duplicate tiles share an inode with the first one
+            inodes = set(os.stat(t).st_ino for t in tiles)
+            self.assertLess(len(inodes), len(tiles))
+
 
 class TestImageSlice(unittest.TestCase):
     def setUp(self):
@@ -562,113 +315,7 @@ class TestWarpPyramid(unittest.TestCase):
                          renderer=TouchRenderer(suffix='.png'))
             self.assertEqual(
                 set(recursive_listdir(outputdir)),
-                set((
-                    '0/',
-                    '0/0/',
-                    '0/0/0.png',
-                    '1/',
-                    '1/0/',
-                    '1/0/0.png',
-                    '1/1/',
-                    '2/',
-                    '2/0/',
-                    '2/0/0.png',
-                    '2/0/1.png',
-                    '2/1/',
-                    '2/1/0.png',
-                    '2/1/1.png',
-                    '2/2/',
-                    '2/3/',
-                    '3/',
-                    '3/0/',
-                    '3/0/0.png',
-                    '3/0/1.png',
-                    '3/0/2.png',
-                    '3/0/3.png',
-                    '3/1/',
-                    '3/1/0.png',
-                    '3/1/1.png',
-                    '3/1/2.png',
-                    '3/1/3.png',
-                    '3/2/',
-                    '3/2/0.png',
-                    '3/2/1.png',
-                    '3/2/2.png',
-                    '3/2/3.png',
-                    '3/3/',
-                    '3/3/0.png',
-                    '3/3/1.png',
-                    '3/3/2.png',
-                    '3/3/3.png',
-                    '3/4/',
-                    '3/5/',
-                    '3/6/',
-                    '3/7/',
-                    # The following are the borders
-                    '1/0/1.png',
-                    '1/1/0.png',
-                    '1/1/1.png',
-                    '2/0/2.png',
-                    '2/0/3.png',
-                    '2/1/2.png',
-                    '2/1/3.png',
-                    '2/2/0.png',
-                    '2/2/1.png',
-                    '2/2/2.png',
-                    '2/2/3.png',
-                    '2/3/0.png',
-                    '2/3/1.png',
-                    '2/3/2.png',
-                    '2/3/3.png',
-                    '3/0/4.png',
-                    '3/0/5.png',
-                    '3/0/6.png',
-                    '3/0/7.png',
-                    '3/1/4.png',
-                    '3/1/5.png',
-                    '3/1/6.png',
-                    '3/1/7.png',
-                    '3/2/4.png',
-                    '3/2/5.png',
-                    '3/2/6.png',
-                    '3/2/7.png',
-                    '3/3/4.png',
-                    '3/3/5.png',
-                    '3/3/6.png',
-                    '3/3/7.png',
-                    '3/4/0.png',
-                    '3/4/1.png',
-                    '3/4/2.png',
-                    '3/4/3.png',
-                    '3/4/4.png',
-                    '3/4/5.png',
-                    '3/4/6.png',
-                    '3/4/7.png',
-                    '3/5/0.png',
-                    '3/5/1.png',
-                    '3/5/2.png',
-                    '3/5/3.png',
-                    '3/5/4.png',
-                    '3/5/5.png',
-                    '3/5/6.png',
-                    '3/5/7.png',
-                    '3/6/0.png',
-                    '3/6/1.png',
-                    '3/6/2.png',
-                    '3/6/3.png',
-                    '3/6/4.png',
-                    '3/6/5.png',
-                    '3/6/6.png',
-                    '3/6/7.png',
-                    '3/7/0.png',
-                    '3/7/1.png',
-                    '3/7/2.png',
-                    '3/7/3.png',
-                    '3/7/4.png',
-                    '3/7/5.png',
-                    '3/7/6.png',
-                    '3/7/7.png',
-                ))
+                pyramid_listing(resolutions=range(0, 4))
             )
 
 
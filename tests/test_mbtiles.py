@@ -145,6 +145,35 @@ class TestMBTiles(unittest.TestCase):
         mbtiles.open()
         self.assertEqual(mbtiles.get(x=0, y=0, z=0), data)
 
+    def test_deferred_commit(self):
+        mbtiles = MBTiles.create(filename=self.filename,
+                                 metadata=self.metadata,
+                                 version=self.version)
+        data = 'PNG image'
+        hashed = hash(data)
+
+        # Insert tile without committing
+        mbtiles.insert(x=0, y=0, z=0, hashed=hashed, data=data, commit=False)
+        self.assertTrue(mbtiles._conn.in_transaction)
+        self.assertEqual(mbtiles.get(x=0, y=0, z=0), data)
+
+        # Commit explicitly
+        mbtiles.commit()
+        self.assertFalse(mbtiles._conn.in_transaction)
+
+        # Closing commits
+        mbtiles.insert(x=1, y=1, z=1, hashed=hashed, commit=False)
+        self.assertTrue(mbtiles._conn.in_transaction)
+        mbtiles.close()
+        mbtiles.open()
+        self.assertFalse(mbtiles._conn.in_transaction)
+        self.assertEqual(mbtiles.get(x=0, y=0, z=0), data)
+        self.assertEqual(mbtiles.get(x=1, y=1, z=1), data)
+
+        # Committing a closed file does nothing
+        mbtiles.close()
+        mbtiles.commit()
+
 
 class TestMetadata(unittest.TestCase):
     def setUp(self):
@@ -15,7 +15,10 @@ from gdal2mbtiles.storages import (MbtilesStorage,
                                    NestedFileStorage, SimpleFileStorage)
 from gdal2mbtiles.gd_types import rgba
 from gdal2mbtiles.utils import intmd5, NamedTemporaryDir, recursive_listdir
-from gdal2mbtiles.vips import VImageAdapter
+from gdal2mbtiles.vips import TmsPyramid, VImageAdapter
+
+
+TEST_ASSET_DIR = os.path.dirname(__file__)
 
 
 class TestSimpleFileStorage(unittest.TestCase):
@@ -53,6 +56,18 @@ class TestSimpleFileStorage(unittest.TestCase):
         self.assertEqual(self.storage.get_hash(image=image),
                          int('f1d3ff8443297732862df21dc4e57262', base=16))
 
+    def test_hasher(self):
+        storage = SimpleFileStorage(outputdir=self.outputdir,
+                                    renderer=self.renderer,
+                                    hasher=len)
+        image = VImageAdapter.new_rgba(width=1, height=1,
+                                ink=rgba(r=0, g=0, b=0, a=0))
+        # One RGBA pixel is 4 bytes long
+        self.assertEqual(storage.get_hash(image=image), 4)
+        storage.save(x=0, y=1, z=2, image=image)
+        self.assertEqual(os.listdir(self.outputdir),
+                         ['2-0-1-4.png'])
+
     def test_save(self):
         image = VImageAdapter.new_rgba(width=1, height=1,
                                 ink=rgba(r=0, g=0, b=0, a=0))
@@ -79,6 +94,37 @@ class TestSimpleFileStorage(unittest.TestCase):
             '2-0-1-f1d3ff8443297732862df21dc4e57262.png'
         )
 
+    def test_save_hashed(self):
+        image = VImageAdapter.new_rgba(width=1, height=1,
+                                ink=rgba(r=0, g=0, b=0, a=0))
+        # A precomputed hash is trusted, not recomputed
+        self.storage.save(x=0, y=1, z=2, image=image, hashed=0xdeadbeef)
+        self.assertEqual(os.listdir(self.outputdir),
+                         ['2-0-1-deadbeef.png'])
+
+    def test_save_hardlink(self):
+        storage = SimpleFileStorage(outputdir=self.outputdir,
+                                    renderer=self.renderer,
+                                    dedup_mode='hardlink')
+        image = VImageAdapter.new_rgba(width=1, height=1,
+                                ink=rgba(r=0, g=0, b=0, a=0))
+        storage.save(x=0, y=1, z=2, image=image)
+        storage.save(x=1, y=0, z=2, image=image)
+
+        first = os.path.join(self.outputdir,
+                             '2-0-1-f1d3ff8443297732862df21dc4e57262.png')
+        second = os.path.join(self.outputdir,
+                              '2-1-0-f1d3ff8443297732862df21dc4e57262.png')
+        # Is this a real file sharing the first tile's inode?
+        self.assertFalse(os.path.islink(second))
+        self.assertEqual(os.stat(first).st_ino, os.stat(second).st_ino)
+
+    def test_invalid_dedup_mode(self):
+        self.assertRaises(ValueError,
+                          SimpleFileStorage,
+                          outputdir=self.outputdir, renderer=self.renderer,
+                          dedup_mode='copy')
+
     def test_symlink(self):
         # Same directory
         src = 'source'
@@ -202,6 +248,21 @@ class TestNestedFileStorage(unittest.TestCase):
             os.path.join(os.path.pardir, os.path.pardir, '2', '0', '1.png')
         )
 
+    def test_save_hardlink(self):
+        storage = NestedFileStorage(outputdir=self.outputdir,
+                                    renderer=self.renderer,
+                                    dedup_mode='hardlink')
+        image = VImageAdapter.new_rgba(width=1, height=1,
+                                ink=rgba(r=0, g=0, b=0, a=0))
+        storage.save(x=0, y=1, z=2, image=image)
+        storage.save(x=1, y=0, z=3, image=image)
+
+        first = os.path.join(self.outputdir, '2', '0', '1.png')
+        second = os.path.join(self.outputdir, '3', '1', '0.png')
+        # Is this a real file sharing the first tile's inode?
+        self.assertFalse(os.path.islink(second))
+        self.assertEqual(os.stat(first).st_ino, os.stat(second).st_ino)
+
     def test_save_border(self):
         # Western hemisphere is border
         self.storage.save_border(x=0, y=0, z=1)
@@ -328,6 +389,23 @@ class TestMbtilesStorage(unittest.TestCase):
             ]
         )
 
+    def test_post_import(self):
+        image = VImageAdapter.new_rgba(width=1, height=1,
+                                ink=rgba(r=0, g=0, b=0, a=0))
+        self.storage.save(x=0, y=1, z=2, image=image)
+        # Tiles are not committed one by one
+        self.assertTrue(self.storage.mbtiles._conn.in_transaction)
+
+        pyramid = TmsPyramid(
+            inputfile=os.path.join(TEST_ASSET_DIR,
+                                   'bluemarble-aligned-ll.tif'),
+            storage=self.storage
+        )
+        self.storage.post_import(pyramid=pyramid)
+        self.assertFalse(self.storage.mbtiles._conn.in_transaction)
+        self.assertEqual(self.storage.mbtiles.metadata['bounds'],
+                         '-90.0,-90.0,0.0,0.0')
+
     def test_save_border(self):
         # Western hemisphere is border
         self.storage.save_border(x=0, y=0, z=1)
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os
+import unittest
+
+from gdal2mbtiles.utils import NamedTemporaryDir, recursive_listdir
+
+
+class TestRecursiveListdir(unittest.TestCase):
+    def test_simple(self):
+        with NamedTemporaryDir() as tempdir:
+            os.makedirs(os.path.join(tempdir, 'a', 'b'))
+            open(os.path.join(tempdir, 'a', 'b', 'c'), 'w').close()
+            self.assertEqual(
+                set(recursive_listdir(tempdir)),
+                set([os.path.join('a', ''),
+                     os.path.join('a', 'b', ''),
+                     os.path.join('a', 'b', 'c')])
+            )
+
+    def test_symlinks(self):
+        with NamedTemporaryDir() as tempdir:
+            os.mkdir(os.path.join(tempdir, 'a'))
+            open(os.path.join(tempdir, 'a', 'b'), 'w').close()
+            # Directory symlinks are listed, but not descended into
+            os.symlink('a', os.path.join(tempdir, 'linked'))
+            # Broken symlinks are listed as files
+            os.symlink('missing', os.path.join(tempdir, 'broken'))
+            self.assertEqual(
+                set(recursive_listdir(tempdir)),
+                set([os.path.join('a', ''),
+                     os.path.join('a', 'b'),
+                     os.path.join('linked', ''),
+                     'broken'])
+            )
+
+    def test_missing(self):
+        with NamedTemporaryDir() as tempdir:
+            self.assertEqual(
+                list(recursive_listdir(os.path.join(tempdir, 'missing'))),
+                []
+            )